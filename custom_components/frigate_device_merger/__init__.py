@@ -1,18 +1,256 @@
 """Frigate Device Merger - Adds MAC addresses to Frigate cameras for device merging."""
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+import ipaddress
 import logging
+import re
+import sys
 from typing import Any
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, Event, ServiceCall
+from aiohttp import ClientTimeout
+from homeassistant.config_entries import SIGNAL_CONFIG_ENTRY_CHANGED, ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, ServiceCall, callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+from homeassistant.setup import async_when_setup_or_start
+from homeassistant.util.json import json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = "frigate_device_merger"
 
+# Integrations whose config entries are trusted to hold a camera's real IP
+CAMERA_DOMAINS = frozenset({"hikvision_isapi", "unifiprotect", "reolink", "axis", "onvif"})
+
+# Upper bound (seconds) on waiting for those integrations before the first scan
+INTEGRATION_LOAD_TIMEOUT = 30
+
+# Strict dotted-quad IPv4 (each octet 0-255) so strings like "300.1.2.3" don't match.
+# Used for hosts, device names and RTSP URLs alike: in rtsp://user:pass@IP:port/path
+# the word boundary already anchors right after the "@", so one pattern scans each string once
+_IPV4_OCTET = r"(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)"
+_IPV4_RE = re.compile(rf"\b(?:{_IPV4_OCTET}\.){{3}}{_IPV4_OCTET}\b")
+
+# RFC 1918 private ranges as half-open integer intervals
+_PRIVATE_IPV4_RANGES = (
+    (0x0A000000, 0x0B000000),  # 10.0.0.0/8
+    (0xAC100000, 0xAC200000),  # 172.16.0.0/12
+    (0xC0A80000, 0xC0A90000),  # 192.168.0.0/16
+)
+
+
+@lru_cache(maxsize=1024)
+def _is_private_ipv4(ip: str) -> bool:
+    """Return True if ip is a dotted-quad IPv4 address in an RFC 1918 range."""
+    try:
+        value = int(ipaddress.IPv4Address(ip))
+    except ValueError:
+        return False
+    return any(low <= value < high for low, high in _PRIVATE_IPV4_RANGES)
+
+
+# Spaces and hyphens both become underscores, matching Frigate's camera naming
+_NORMALIZE_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+
+def _normalize(name: str) -> str:
+    """Return the canonical key used to match camera names across integrations."""
+    return name.lower().translate(_NORMALIZE_TABLE).removesuffix("_camera")
+
+
+@dataclass(slots=True)
+class _DevView:
+    """Per-scan snapshot of the device fields the merger looks at."""
+
+    entry: dr.DeviceEntry
+    is_frigate: bool
+    mac: str | None
+    ip: str | None
+    ip_source: str = "unknown"
+
+
+def _config_entry_ip(config_entry: ConfigEntry) -> str | None:
+    """Return the private IP a camera integration's config entry points at, if any."""
+    data = config_entry.data
+    # One probe per key; the IP is extracted since host may be a hostname and url a full URL
+    if not (address := data.get("host") or data.get("ip_address") or data.get("url")):
+        return None
+    ip_match = _IPV4_RE.search(address)
+    # Validate it's a private IP (cameras are usually on local network)
+    if ip_match and _is_private_ipv4(ip_match.group()):
+        return ip_match.group()
+    return None
+
+
+def _build_views(
+    devices: Iterable[dr.DeviceEntry], entry_ips: dict[str, tuple[str, str]]
+) -> list[_DevView]:
+    """Scan each device's identifiers, connections and config entries exactly once."""
+    # Bind the lookups used for every device to locals once per scan
+    conn_mac = dr.CONNECTION_NETWORK_MAC
+    get_entry_ip = entry_ips.get
+    ipv4_search = _IPV4_RE.search
+    is_private_ipv4 = _is_private_ipv4
+    views: list[_DevView] = []
+    
+    for device_entry in devices:
+        # Identifiers and connections are sets of (domain/type, id) pairs; turning them
+        # into dicts lets the lookups below run in C instead of Python loops
+        identifiers = dict(device_entry.identifiers)
+        is_frigate = "frigate" in identifiers
+        
+        # Get MAC address from connections, falling back to the MAC identifier
+        mac_address = dict(device_entry.connections).get(conn_mac) or identifiers.get("mac")
+        if mac_address:
+            # Lowercase once here and intern it, so every map built from the views and
+            # each set membership test downstream shares the one canonical string
+            mac_address = sys.intern(mac_address.lower())
+        
+        # Frigate devices get their IP from the Frigate config; devices without a MAC are useless
+        if is_frigate or not mac_address:
+            views.append(_DevView(device_entry, is_frigate, mac_address, None))
+            continue
+        
+        # Use the IP of the first camera integration config entry that has a usable one
+        ip_address = None
+        ip_source = "unknown"
+        for config_entry_id in device_entry.config_entries:
+            if (entry_ip := get_entry_ip(config_entry_id)) is not None:
+                ip_address, ip_source = entry_ip
+                break
+        else:
+            # Fallback: try to extract IP from device name (but be careful - device names might have wrong IPs)
+            # Most names have no dotted quad at all, so reject them before running the regex
+            device_name = device_entry.name or ""
+            ip_match = ipv4_search(device_name) if device_name.count(".") >= 3 else None
+            # Only trust private IPs from device names
+            if ip_match and is_private_ipv4(ip_match.group()):
+                ip_address = ip_match.group()
+        
+        views.append(_DevView(device_entry, False, mac_address, ip_address, ip_source))
+    
+    return views
+
+
+def _iter_ip_mac_pairs(views: Iterable[_DevView]) -> Iterator[tuple[str, str, _DevView]]:
+    """Yield (ip, mac, view) for every non-Frigate view that has both an IP and a MAC."""
+    for view in views:
+        # Frigate devices are updated later - we want to get MACs from other integrations
+        if not view.is_frigate and view.ip and view.mac:
+            yield view.ip, view.mac, view
+
+
+def _first_rtsp_ip(urls: Iterable[Any]) -> str | None:
+    """Return the camera IP from the first RTSP URL in urls that contains a private one.
+    
+    Loopback go2rtc restreams (rtsp://127.0.0.1:8554/...) are skipped since they never
+    point at the camera itself.
+    """
+    return next(
+        (
+            ip_match.group()
+            for url in urls
+            if isinstance(url, str)
+            and url.startswith("rtsp://")
+            and (ip_match := _IPV4_RE.search(url))
+            and _is_private_ipv4(ip_match.group())
+        ),
+        None,
+    )
+
+
+def _parse_frigate_camera_ips(config_data: dict[str, Any]) -> dict[str, str]:
+    """Extract camera name -> IP from a Frigate /api/config payload."""
+    frigate_camera_to_ip: dict[str, str] = {}
+    
+    # Extract camera IPs from go2rtc streams (most reliable)
+    for camera_name, streams in ((config_data.get("go2rtc") or {}).get("streams") or {}).items():
+        if ip := _first_rtsp_ip(streams if isinstance(streams, list) else [streams]):
+            frigate_camera_to_ip[_normalize(camera_name)] = ip
+            _LOGGER.debug("Got IP %s for Frigate camera '%s' from go2rtc config", ip, camera_name)
+    
+    # Also check cameras section for IPs in ffmpeg inputs
+    for camera_name, camera_config in (config_data.get("cameras") or {}).items():
+        if (name_key := _normalize(camera_name)) in frigate_camera_to_ip:
+            continue
+        inputs = (camera_config.get("ffmpeg") or {}).get("inputs") or []
+        if ip := _first_rtsp_ip(i.get("path") if isinstance(i, dict) else i for i in inputs):
+            frigate_camera_to_ip[name_key] = ip
+            _LOGGER.debug("Got IP %s for Frigate camera '%s' from ffmpeg config", ip, camera_name)
+    
+    return frigate_camera_to_ip
+
+
+async def _async_get_frigate_camera_ips(hass: HomeAssistant, frigate_url: str) -> dict[str, str]:
+    """Fetch camera IPs from the Frigate API, reusing the last result while the config is unchanged."""
+    cache: dict[str, Any] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        "frigate_cfg_cache", {"url": None, "etag": None, "last_modified": None, "camera_to_ip": {}}
+    )
+    
+    # Ask Frigate to skip the body if the config hasn't changed since the last scan
+    headers: dict[str, str] = {}
+    if cache["url"] == frigate_url:
+        if cache["etag"]:
+            headers["If-None-Match"] = cache["etag"]
+        elif cache["last_modified"]:
+            headers["If-Modified-Since"] = cache["last_modified"]
+    
+    # Call Frigate API to get config, reusing Home Assistant's shared connection pool
+    session = async_get_clientsession(hass)
+    async with session.get(
+        f"{frigate_url}/api/config", headers=headers, timeout=ClientTimeout(total=5)
+    ) as response:
+        if response.status == 304:
+            _LOGGER.debug("Frigate config unchanged, reusing cached camera IPs")
+            return cache["camera_to_ip"]
+        if response.status != 200:
+            return {}
+        
+        # Decode with Home Assistant's orjson-backed loader rather than the stdlib json module
+        config_data = await response.json(loads=json_loads)
+        frigate_camera_to_ip = _parse_frigate_camera_ips(config_data)
+        cache["url"] = frigate_url
+        cache["etag"] = response.headers.get("ETag")
+        cache["last_modified"] = response.headers.get("Last-Modified")
+        cache["camera_to_ip"] = frigate_camera_to_ip
+        return frigate_camera_to_ip
+
+
+def _log_scan_summary(frigate_camera_count: int, mapping_count: int, updated_count: int) -> None:
+    """Log the outcome of a scan, with a hint when nothing could be updated."""
+    _LOGGER.info(
+        "=== Frigate Device Merger scan complete ==="
+    )
+    _LOGGER.info(
+        "Found %d Frigate camera(s), %d IP-to-MAC mappings, updated %d camera(s)",
+        frigate_camera_count,
+        mapping_count,
+        updated_count
+    )
+    
+    if updated_count > 0:
+        _LOGGER.info("✓ Successfully updated %d Frigate camera(s) with MAC addresses", updated_count)
+    elif frigate_camera_count == 0:
+        _LOGGER.warning("No Frigate cameras found. Make sure Frigate integration is set up.")
+    elif mapping_count == 0:
+        _LOGGER.warning(
+            "Found %d Frigate camera(s) but no MAC addresses from other integrations. "
+            "Make sure your camera integrations (Hikvision, Unifi, etc.) are configured.",
+            frigate_camera_count
+        )
+    else:
+        _LOGGER.warning(
+            "Found %d Frigate camera(s) and %d MAC address(es) but couldn't match them by IP. "
+            "Check that IP addresses match between Frigate and other integrations.",
+            frigate_camera_count,
+            mapping_count
+        )
+
 
 async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
     """Set up the Frigate Device Merger component."""
@@ -22,15 +260,13 @@ async def async_setup(hass: HomeAssistant, config: dict[str, Any]) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Frigate Device Merger from a config entry."""
-    import asyncio
-    
-    _LOGGER.error("=== Frigate Device Merger: Integration loaded ===")
-    _LOGGER.error("Entry ID: %s, Entry data: %s", entry.entry_id, entry.data)
+    _LOGGER.debug("=== Frigate Device Merger: Integration loaded ===")
+    _LOGGER.debug("Entry ID: %s", entry.entry_id)
     
     # Register service in async_setup_entry (not async_setup) to avoid services.yaml requirement
     async def update_devices_service(call: ServiceCall) -> None:
         """Service to manually trigger Frigate device update."""
-        _LOGGER.error("Manual update triggered via service call")
+        _LOGGER.debug("Manual update triggered via service call")
         try:
             await async_update_frigate_devices(hass)
         except Exception as e:
@@ -41,286 +277,223 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "update_devices",
         update_devices_service,
     )
-    _LOGGER.error("Service registered: %s.update_devices", DOMAIN)
+    _LOGGER.debug("Service registered: %s.update_devices", DOMAIN)
+    
+    # Drop the cached IP maps whenever devices or config entries change
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    
+    @callback
+    def invalidate_scan_cache(*_: Any) -> None:
+        domain_data.pop("scan_cache", None)
+    
+    entry.async_on_unload(
+        hass.bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, invalidate_scan_cache)
+    )
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_CONFIG_ENTRY_CHANGED, invalidate_scan_cache)
+    )
     
     async def run_update():
         """Run the update with error handling."""
         try:
-            _LOGGER.error("Running Frigate device merger update...")
+            _LOGGER.debug("Running Frigate device merger update...")
             await async_update_frigate_devices(hass)
         except Exception as e:
             _LOGGER.error("Error in Frigate device merger update: %s", e, exc_info=True)
     
-    async def delayed_update(event: Event = None):
-        """Wait for Home Assistant to fully start and other integrations to initialize."""
-        _LOGGER.error("Waiting 15 seconds for other integrations to initialize...")
-        await asyncio.sleep(15)
-        _LOGGER.error("15 seconds elapsed, running update now...")
-        await run_update()
-    
-    # Listen for Home Assistant start event, then wait additional time
-    async def on_started(event: Event):
-        _LOGGER.error("Home Assistant started event received, scheduling update")
-        hass.async_create_task(delayed_update(event))
-    
-    # Always listen for the start event
-    _LOGGER.error("Registering event listener for HOMEASSISTANT_STARTED")
-    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, on_started)
-    
-    # If already started, run immediately with delay
-    if hass.is_running:
-        _LOGGER.error("Home Assistant already running, scheduling immediate update")
-        hass.async_create_task(delayed_update())
-    else:
-        _LOGGER.error("Home Assistant not running yet, waiting for start event")
+    # Run the first scan as soon as Frigate and every configured camera integration
+    # have finished setting up, with a watchdog in case one of them is slow. If the
+    # watchdog fires first, the last integration to finish triggers one more scan so
+    # devices that showed up late still get merged
+    pending_domains = {"frigate"} | {
+        config_entry.domain
+        for config_entry in hass.config_entries.async_entries()
+        if config_entry.domain in CAMERA_DOMAINS
+    }
+    cancel_watchdog: CALLBACK_TYPE | None = None
+    
+    @callback
+    def schedule_update() -> None:
+        nonlocal cancel_watchdog
+        if cancel_watchdog is not None:
+            cancel_watchdog()
+            cancel_watchdog = None
+        hass.async_create_task(run_update())
+    
+    async def integration_ready(_hass: HomeAssistant, component: str) -> None:
+        pending_domains.discard(component)
+        _LOGGER.debug("%s is set up, still waiting for: %s", component, pending_domains or "nothing")
+        if not pending_domains:
+            schedule_update()
+    
+    @callback
+    def watchdog_expired(_now: Any) -> None:
+        nonlocal cancel_watchdog
+        cancel_watchdog = None
+        _LOGGER.debug(
+            "Integrations still loading after %d seconds (%s), running update anyway",
+            INTEGRATION_LOAD_TIMEOUT,
+            pending_domains,
+        )
+        schedule_update()
+    
+    cancel_watchdog = async_call_later(hass, INTEGRATION_LOAD_TIMEOUT, watchdog_expired)
+    for domain in list(pending_domains):
+        async_when_setup_or_start(hass, domain, integration_ready)
+    
+    @callback
+    def cancel_pending_watchdog() -> None:
+        if cancel_watchdog is not None:
+            cancel_watchdog()
+    
+    entry.async_on_unload(cancel_pending_watchdog)
     
     return True
 
 
+@callback
+def _async_build_ip_maps(
+    hass: HomeAssistant, device_registry: dr.DeviceRegistry
+) -> tuple[dict[str, str], dict[str, list[str]]]:
+    """Build the IP -> MAC map and the IP -> device names map from camera integration devices."""
+    debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
+    ip_to_device_names: dict[str, list[str]] = {}
+    
+    # Only camera integrations are trusted for IPs; resolve each of their config entries'
+    # IP once so devices only need a dict lookup per config entry
+    camera_entries = [
+        entry for entry in hass.config_entries.async_entries() if entry.domain in CAMERA_DOMAINS
+    ]
+    entry_ips = {
+        entry.entry_id: (ip_address, entry.domain)
+        for entry in camera_entries
+        if (ip_address := _config_entry_ip(entry))
+    }
+    
+    # Only devices of those integrations can contribute, so fetch them through the
+    # registry's config entry index instead of sweeping every device
+    camera_devices = {
+        device_entry.id: device_entry
+        for entry in camera_entries
+        for device_entry in dr.async_entries_for_config_entry(device_registry, entry.entry_id)
+    }
+    
+    # Only a handful of camera devices reach this point, so building the views inline is
+    # cheaper than an executor round-trip; everything downstream works off these views
+    views = _build_views(camera_devices.values(), entry_ips)
+    
+    ip_to_mac: dict[str, str] = {}
+    for ip_address, mac_address, view in _iter_ip_mac_pairs(views):
+        ip_to_device_names.setdefault(ip_address, []).append(view.entry.name or "")
+        
+        # The first device seen for an IP keeps it; warn about later conflicting ones
+        if (mapped_mac := ip_to_mac.setdefault(ip_address, mac_address)) != mac_address:
+            _LOGGER.warning(
+                "IP %s already mapped to MAC %s, but device '%s' has MAC %s. "
+                "Skipping this mapping to avoid conflicts.",
+                ip_address, mapped_mac, view.entry.name, mac_address
+            )
+        elif debug_enabled:
+            _LOGGER.debug("Found MAC %s for IP %s from device: %s (%s)", 
+                        mac_address, ip_address, view.entry.name, view.ip_source)
+    
+    return ip_to_mac, ip_to_device_names
+
+
 async def async_update_frigate_devices(hass: HomeAssistant) -> None:
     """Update Frigate camera devices with MAC addresses from other integrations."""
-    import re
-    
     _LOGGER.info("=== Starting Frigate Device Merger scan ===")
     device_registry = dr.async_get(hass)
+    debug_enabled = _LOGGER.isEnabledFor(logging.DEBUG)
     
-    # Build a map of IP addresses to MAC addresses from other integrations
-    ip_to_mac: dict[str, str] = {}
-    
-    # Scan all devices to find MAC addresses and their associated IPs
-    for device_entry in device_registry.devices.values():
-        # Skip Frigate devices - we want to get MACs from other integrations
-        is_frigate = False
-        for identifier_domain, _ in device_entry.identifiers:
-            if identifier_domain == "frigate":
-                is_frigate = True
-                break
-        if is_frigate:
-            continue
-        
-        # Get MAC address from connections
-        mac_address = None
-        for connection_type, connection_id in device_entry.connections:
-            if connection_type == dr.CONNECTION_NETWORK_MAC:
-                mac_address = connection_id.lower()
-                break
-        
-        # Also check identifiers for MAC
-        if not mac_address:
-            for identifier_domain, identifier_id in device_entry.identifiers:
-                if identifier_domain == "mac":
-                    mac_address = identifier_id.lower()
-                    break
-        
-        if not mac_address:
-            continue
-        
-        # Try to get IP address from config entry data
-        # Only trust IPs from camera integrations, and only if they make sense
-        ip_address = None
-        for config_entry_id in device_entry.config_entries:
-            config_entry = hass.config_entries.async_get_entry(config_entry_id)
-            if config_entry and config_entry.domain in ("hikvision_isapi", "unifiprotect", "reolink"):
-                # Only get IP from camera integrations
-                if "host" in config_entry.data:
-                    host = config_entry.data["host"]
-                    # Extract IP from host (might be hostname or IP)
-                    ip_match = re.search(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', host)
-                    if ip_match:
-                        ip_address = ip_match.group()
-                        # Validate it's a private IP (cameras are usually on local network)
-                        if ip_address.startswith(("192.168.", "10.", "172.16.", "172.17.", "172.18.", "172.19.", "172.20.", "172.21.", "172.22.", "172.23.", "172.24.", "172.25.", "172.26.", "172.27.", "172.28.", "172.29.", "172.30.", "172.31.")):
-                            break
-                        else:
-                            ip_address = None  # Not a private IP, probably wrong
-                elif "ip_address" in config_entry.data:
-                    ip_address = config_entry.data["ip_address"]
-                    if ip_address.startswith(("192.168.", "10.", "172.16.")):
-                        break
-                    else:
-                        ip_address = None
-        
-        # Fallback: try to extract IP from device name (but be careful - device names might have wrong IPs)
-        if not ip_address:
-            device_name = device_entry.name or ""
-            ip_match = re.search(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', device_name)
-            if ip_match:
-                potential_ip = ip_match.group()
-                # Only trust private IPs from device names
-                if potential_ip.startswith(("192.168.", "10.", "172.16.")):
-                    ip_address = potential_ip
-        
-        if ip_address and mac_address:
-            # Only add if we haven't seen this IP before, or log a warning if there's a conflict
-            if ip_address in ip_to_mac and ip_to_mac[ip_address] != mac_address:
-                _LOGGER.warning(
-                    "IP %s already mapped to MAC %s, but device '%s' has MAC %s. "
-                    "Skipping this mapping to avoid conflicts.",
-                    ip_address, ip_to_mac[ip_address], device_entry.name, mac_address
-                )
-            else:
-                ip_to_mac[ip_address] = mac_address
-                _LOGGER.info("Found MAC %s for IP %s from device: %s (%s)", 
-                           mac_address, ip_address, device_entry.name, config_entry.domain if config_entry else "unknown")
+    # The IP maps only depend on the device registry and config entries, so they are
+    # reused until a registry or config entry change invalidates them
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scan_cache := domain_data.get("scan_cache")) is not None:
+        _LOGGER.debug("Registry unchanged since last scan, reusing IP-to-MAC mappings")
+        ip_to_mac, ip_to_device_names = scan_cache
+    else:
+        ip_to_mac, ip_to_device_names = _async_build_ip_maps(hass, device_registry)
+        domain_data["scan_cache"] = (ip_to_mac, ip_to_device_names)
     
     _LOGGER.info("Found %d IP-to-MAC mappings from other integrations", len(ip_to_mac))
     
+    # Look up Frigate devices through the registry's config entry index instead of
+    # filtering the full device list
+    frigate_entries = hass.config_entries.async_entries("frigate")
+    frigate_devices = {
+        device_entry.id: device_entry
+        for frigate_entry in frigate_entries
+        for device_entry in dr.async_entries_for_config_entry(device_registry, frigate_entry.entry_id)
+    }
+    frigate_camera_count = len(frigate_devices)
+    
+    # Without any MAC to hand out (or any Frigate device to give it to) the
+    # Frigate API call and the update pass could only produce warnings
+    if not ip_to_mac or not frigate_devices:
+        _LOGGER.debug("Nothing to match; skipping Frigate update pass")
+        _log_scan_summary(frigate_camera_count, len(ip_to_mac), 0)
+        return
+    
     # Get Frigate camera IPs from Frigate API/config
     # This is the correct source - Frigate knows the real camera IPs
     frigate_camera_to_ip: dict[str, str] = {}
     
     # Try to get Frigate config from API
-    frigate_config_entry = None
-    for config_entry in hass.config_entries.async_entries("frigate"):
-        frigate_config_entry = config_entry
-        break
-    
-    if frigate_config_entry:
-        try:
-            # Get Frigate URL from config
-            frigate_url = frigate_config_entry.data.get("url") or frigate_config_entry.data.get("host", "http://ccab4aaf-frigate:5000")
-            if not frigate_url.startswith("http"):
-                frigate_url = f"http://{frigate_url}"
-            
-            # Call Frigate API to get config
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                try:
-                    async with session.get(f"{frigate_url}/api/config", timeout=aiohttp.ClientTimeout(total=5)) as response:
-                        if response.status == 200:
-                            config_data = await response.json()
-                            
-                            # Extract camera IPs from go2rtc streams (most reliable)
-                            if "go2rtc" in config_data and "streams" in config_data["go2rtc"]:
-                                for camera_name, stream_configs in config_data["go2rtc"]["streams"].items():
-                                    if isinstance(stream_configs, list):
-                                        for stream_config in stream_configs:
-                                            if isinstance(stream_config, str) and stream_config.startswith("rtsp://"):
-                                                # Extract IP from RTSP URL: rtsp://user:pass@IP:port/path
-                                                ip_match = re.search(r'@([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})', stream_config)
-                                                if ip_match:
-                                                    frigate_camera_to_ip[camera_name.lower()] = ip_match.group(1)
-                                                    _LOGGER.info("Got IP %s for Frigate camera '%s' from go2rtc config", ip_match.group(1), camera_name)
-                                                    break
-                            
-                            # Also check cameras section for IPs in ffmpeg inputs
-                            if "cameras" in config_data:
-                                for camera_name, camera_config in config_data["cameras"].items():
-                                    if camera_name.lower() not in frigate_camera_to_ip:
-                                        if "ffmpeg" in camera_config and "inputs" in camera_config["ffmpeg"]:
-                                            for input_config in camera_config["ffmpeg"]["inputs"]:
-                                                if isinstance(input_config, dict) and "path" in input_config:
-                                                    path = input_config["path"]
-                                                    if path.startswith("rtsp://"):
-                                                        ip_match = re.search(r'@([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})', path)
-                                                        if ip_match:
-                                                            frigate_camera_to_ip[camera_name.lower()] = ip_match.group(1)
-                                                            _LOGGER.info("Got IP %s for Frigate camera '%s' from ffmpeg config", ip_match.group(1), camera_name)
-                                                            break
-                                                elif isinstance(input_config, str) and input_config.startswith("rtsp://"):
-                                                    ip_match = re.search(r'@([0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3}\.[0-9]{1,3})', input_config)
-                                                    if ip_match:
-                                                        frigate_camera_to_ip[camera_name.lower()] = ip_match.group(1)
-                                                        _LOGGER.info("Got IP %s for Frigate camera '%s' from ffmpeg input", ip_match.group(1), camera_name)
-                                                        break
-                            
-                            _LOGGER.info("Got %d camera IPs from Frigate API", len(frigate_camera_to_ip))
-                except Exception as e:
-                    _LOGGER.warning("Failed to get Frigate config from API: %s", e)
-        except Exception as e:
-            _LOGGER.warning("Failed to access Frigate API: %s", e)
+    frigate_config_entry = frigate_entries[0]
+    try:
+        # Get Frigate URL from config
+        frigate_url = frigate_config_entry.data.get("url") or frigate_config_entry.data.get("host", "http://ccab4aaf-frigate:5000")
+        if not frigate_url.startswith("http"):
+            frigate_url = f"http://{frigate_url}"
+        
+        frigate_camera_to_ip = await _async_get_frigate_camera_ips(hass, frigate_url)
+        _LOGGER.info("Got %d camera IPs from Frigate API", len(frigate_camera_to_ip))
+    except Exception as e:
+        _LOGGER.warning("Failed to get Frigate config from API: %s", e)
     
     # Fallback: Build a map of camera names to IPs from other integrations' config entries
     # Only use this if we couldn't get IPs from Frigate API
     camera_name_to_ip: dict[str, str] = {}
     if not frigate_camera_to_ip:
-        # First, build IP->device_name map from devices we already scanned
-    ip_to_device_names: dict[str, list[str]] = {}
-    for device_entry in device_registry.devices.values():
-        # Skip Frigate devices
-        is_frigate = False
-        for identifier_domain, _ in device_entry.identifiers:
-            if identifier_domain == "frigate":
-                is_frigate = True
-                break
-        if is_frigate:
-            continue
-        
-        # Get MAC address
-        mac_address = None
-        for connection_type, connection_id in device_entry.connections:
-            if connection_type == dr.CONNECTION_NETWORK_MAC:
-                mac_address = connection_id.lower()
-                break
-        
-        if not mac_address:
-            continue
-        
-        # Get IP address (same logic as before)
-        ip_address = None
-        for config_entry_id in device_entry.config_entries:
-            config_entry = hass.config_entries.async_get_entry(config_entry_id)
-            if config_entry:
-                if "host" in config_entry.data:
-                    host = config_entry.data["host"]
-                    ip_match = re.search(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', host)
-                    if ip_match:
-                        ip_address = ip_match.group()
-                        break
-        
-        if ip_address:
-            device_name = device_entry.name or ""
-            if ip_address not in ip_to_device_names:
-                ip_to_device_names[ip_address] = []
-            ip_to_device_names[ip_address].append(device_name)
-    
-    # Now build name->IP map with all name variations
-    for ip_address, device_names in ip_to_device_names.items():
-        for device_name in device_names:
-            # Create all possible name variations
-            name_variations = [
-                device_name.lower().replace(" ", "_").replace("-", "_"),
-                device_name.lower().replace(" ", "_"),
-                device_name.lower().replace("-", "_"),
-                device_name.lower(),
-                # Also try without common suffixes
-                device_name.lower().replace(" camera", "").replace(" ", "_"),
-                device_name.lower().replace(" camera", "").replace("-", "_"),
-            ]
-            for name_var in name_variations:
-                if name_var:  # Don't add empty strings
-                    camera_name_to_ip[name_var] = ip_address
-            _LOGGER.info("Mapped device name '%s' to IP %s (variations: %s)", 
-                       device_name, ip_address, name_variations[:3])
-    
-    _LOGGER.info("Frigate camera IPs: %s", frigate_camera_to_ip)
-    _LOGGER.info("Fallback camera name IPs: %s", camera_name_to_ip)
+        # Build name->IP map keyed on the same canonical form used for lookups
+        for ip_address, device_names in ip_to_device_names.items():
+            for device_name in device_names:
+                if name_key := _normalize(device_name):  # Don't add empty strings
+                    camera_name_to_ip[name_key] = ip_address
+                    if debug_enabled:
+                        _LOGGER.debug("Mapped device name '%s' to IP %s (as '%s')", device_name, ip_address, name_key)
+    
+    # These maps can be large on big sites - don't build their repr unless DEBUG is enabled
+    if debug_enabled:
+        _LOGGER.debug("Frigate camera IPs: %s", frigate_camera_to_ip)
+        _LOGGER.debug("Fallback camera name IPs: %s", camera_name_to_ip)
     
     # Now find Frigate devices and update them
-    frigate_devices_updated = 0
-    frigate_camera_count = 0
-    
-    for device_entry in device_registry.devices.values():
-        # Check if this is a Frigate device
-        is_frigate = False
-        for identifier_domain, identifier_id in device_entry.identifiers:
-            if identifier_domain == "frigate":
-                is_frigate = True
-                frigate_camera_count += 1
-                break
-        
-        if not is_frigate:
-            continue
-        
+    updated_cameras: list[str] = []
+    conn_mac = dr.CONNECTION_NETWORK_MAC
+    
+    # The Frigate integration identifies its server device by the bare config entry ID
+    # (cameras use "<entry_id>:<camera>"), so servers can be skipped without a name check
+    frigate_server_identifiers = {
+        ("frigate", config_entry.entry_id)
+        for config_entry in frigate_entries
+    }
+    
+    for device_entry in frigate_devices.values():
         device_name = device_entry.name or ""
         
         # Skip the main Frigate server device (usually just named "Frigate")
         # We only want individual camera devices
-        if device_name.lower() == "frigate" or device_name.lower().startswith("frigate "):
+        if (
+            not frigate_server_identifiers.isdisjoint(device_entry.identifiers)
+            or (name_lower := device_name.lower()) == "frigate"
+            or name_lower.startswith("frigate ")
+        ):
             _LOGGER.debug("Skipping main Frigate server device: %s", device_name)
             continue
         
-        camera_name_normalized = device_name.lower().replace(" ", "_").replace("-", "_")
+        camera_name_normalized = _normalize(device_name)
         
         # Try to find IP for this Frigate camera
         camera_ip = None
@@ -328,91 +501,63 @@ async def async_update_frigate_devices(hass: HomeAssistant) -> None:
         # Method 1: Get IP from Frigate API/config (most reliable)
         if camera_name_normalized in frigate_camera_to_ip:
             camera_ip = frigate_camera_to_ip[camera_name_normalized]
-            _LOGGER.info("Got IP %s for Frigate camera '%s' from Frigate config", camera_ip, device_name)
+            _LOGGER.debug("Got IP %s for Frigate camera '%s' from Frigate config", camera_ip, device_name)
         
         # Method 2: Match by camera name from other integrations (fallback)
-        if not camera_ip and camera_name_normalized in camera_name_to_ip:
-            camera_ip = camera_name_to_ip[camera_name_normalized]
-            _LOGGER.info("Matched Frigate camera '%s' to IP %s by name from other integration", device_name, camera_ip)
+        if not camera_ip and camera_name_to_ip:
+            camera_ip = camera_name_to_ip.get(camera_name_normalized)
+            if camera_ip:
+                _LOGGER.debug("Matched Frigate camera '%s' to IP %s by name from other integration", device_name, camera_ip)
         
         # Method 3: Try to extract IP from device name
-        if not camera_ip:
-            ip_match = re.search(r'\b(?:[0-9]{1,3}\.){3}[0-9]{1,3}\b', device_name)
+        if not camera_ip and device_name.count(".") >= 3:
+            ip_match = _IPV4_RE.search(device_name)
             if ip_match:
                 camera_ip = ip_match.group()
-                _LOGGER.info("Extracted IP %s from Frigate device name '%s'", camera_ip, device_name)
+                _LOGGER.debug("Extracted IP %s from Frigate device name '%s'", camera_ip, device_name)
         
-        # Method 3: Check device's entities for stream URLs (but Frigate uses go2rtc proxy, so this won't work)
-        # Skip this - Frigate cameras go through go2rtc proxy at 127.0.0.1
+        # Camera entity states (stream_source etc.) are deliberately not consulted: Frigate
+        # cameras stream through the go2rtc proxy at 127.0.0.1, so they never carry the real IP
         
         # If we found an IP, look up MAC address
         if camera_ip and camera_ip in ip_to_mac:
             mac_address = ip_to_mac[camera_ip]
             
-            # Check if MAC is already added
-            has_mac = False
-            for conn_type, conn_id in device_entry.connections:
-                if conn_type == dr.CONNECTION_NETWORK_MAC and conn_id.lower() == mac_address:
-                    has_mac = True
-                    break
+            # Check if MAC is already added (the registry stores MAC connections lowercased)
+            has_mac = (conn_mac, mac_address) in device_entry.connections
             
             if not has_mac:
                 # Check if MAC is already registered to another device
-                mac_already_registered = False
-                for other_device in device_registry.devices.values():
-                    if other_device.id == device_entry.id:
-                        continue  # Skip self
-                    for conn_type, conn_id in other_device.connections:
-                        if conn_type == dr.CONNECTION_NETWORK_MAC and conn_id.lower() == mac_address:
-                            mac_already_registered = True
-                            _LOGGER.info(
-                                "MAC %s already registered to device '%s' (%s). "
-                                "Home Assistant will merge devices automatically.",
-                                mac_address, other_device.name or "Unknown", other_device.manufacturer or "Unknown"
-                            )
-                            break
-                    if mac_already_registered:
-                        break
+                other_device = device_registry.async_get_device(
+                    identifiers={("mac", mac_address)},
+                    connections={(conn_mac, mac_address)},
+                )
+                mac_already_registered = other_device is not None and other_device.id != device_entry.id
+                if mac_already_registered:
+                    _LOGGER.debug(
+                        "MAC %s already registered to device '%s' (%s). "
+                        "Home Assistant will merge devices automatically.",
+                        mac_address, other_device.name or "Unknown", other_device.manufacturer or "Unknown"
+                    )
                 
                 if not mac_already_registered:
-                    # Get current identifiers and connections
-                    current_identifiers = set(device_entry.identifiers)
-                    current_connections = set(device_entry.connections)
-                    
-                    # Add MAC address identifier and connection
-                    new_identifiers = current_identifiers.copy()
-                    new_identifiers.add(("mac", mac_address))
-                    
-                    new_connections = current_connections.copy()
-                    new_connections.add((dr.CONNECTION_NETWORK_MAC, mac_address))
-                    
-                    # Update device registry
+                    # Update device registry, adding the MAC address identifier and connection
                     try:
                         device_registry.async_update_device(
                             device_entry.id,
-                            new_identifiers=new_identifiers,
-                            new_connections=new_connections,
+                            new_identifiers={*device_entry.identifiers, ("mac", mac_address)},
+                            new_connections={*device_entry.connections, (conn_mac, mac_address)},
                         )
-                        
-                        frigate_devices_updated += 1
-                        _LOGGER.info(
-                            "✓ Updated Frigate device '%s' (IP: %s) with MAC address: %s",
-                            device_name,
-                            camera_ip,
-                            mac_address,
+                        updated_cameras.append(f"{device_name} ({camera_ip} -> {mac_address})")
+                    except dr.DeviceCollisionError:
+                        # Handle collision errors gracefully (covers both connection and identifier clashes)
+                        _LOGGER.debug(
+                            "MAC %s collision detected for device '%s'. "
+                            "This is expected - Home Assistant will merge devices automatically.",
+                            mac_address, device_name
                         )
-                    except Exception as e:
-                        # Handle collision errors gracefully
-                        if "DeviceConnectionCollisionError" in str(type(e).__name__) or "already registered" in str(e).lower():
-                            _LOGGER.info(
-                                "MAC %s collision detected for device '%s'. "
-                                "This is expected - Home Assistant will merge devices automatically.",
-                                mac_address, device_name
-                            )
-                        else:
-                            raise
             else:
-                _LOGGER.info("Frigate device '%s' already has MAC address", device_name)
+                _LOGGER.debug("Frigate device '%s' already has MAC address", device_name)
         elif camera_ip:
             _LOGGER.warning(
                 "Could not find MAC address for Frigate camera '%s' (IP: %s). "
@@ -423,31 +568,7 @@ async def async_update_frigate_devices(hass: HomeAssistant) -> None:
         else:
             _LOGGER.warning("Could not find IP address for Frigate camera '%s'", device_name)
     
-    # Log summary
-    _LOGGER.info(
-        "=== Frigate Device Merger scan complete ==="
-    )
-    _LOGGER.info(
-        "Found %d Frigate camera(s), %d IP-to-MAC mappings, updated %d camera(s)",
-        frigate_camera_count,
-        len(ip_to_mac),
-        frigate_devices_updated
-    )
+    if updated_cameras:
+        _LOGGER.info("✓ Updated Frigate device(s) with MAC addresses: %s", ", ".join(updated_cameras))
     
-    if frigate_devices_updated > 0:
-        _LOGGER.info("✓ Successfully updated %d Frigate camera(s) with MAC addresses", frigate_devices_updated)
-    elif frigate_camera_count == 0:
-        _LOGGER.warning("No Frigate cameras found. Make sure Frigate integration is set up.")
-    elif len(ip_to_mac) == 0:
-        _LOGGER.warning(
-            "Found %d Frigate camera(s) but no MAC addresses from other integrations. "
-            "Make sure your camera integrations (Hikvision, Unifi, etc.) are configured.",
-            frigate_camera_count
-        )
-    else:
-        _LOGGER.warning(
-            "Found %d Frigate camera(s) and %d MAC address(es) but couldn't match them by IP. "
-            "Check that IP addresses match between Frigate and other integrations.",
-            frigate_camera_count,
-            len(ip_to_mac)
-        )
+    _log_scan_summary(frigate_camera_count, len(ip_to_mac), len(updated_cameras))